@@ -0,0 +1,125 @@
+import pandas as pd
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add the src directory to the Python path to allow importing batch_prediction
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batch_prediction import resolve_query_dates, predict_batch, MAX_BATCH_DATES
+
+def fake_predict(future):
+    """Returns a deterministic forecast where yhat is the day of the year."""
+    day_of_year = future['ds'].dt.dayofyear.astype(float)
+    return pd.DataFrame({
+        'ds': future['ds'],
+        'yhat': day_of_year,
+        'yhat_lower': day_of_year - 1,
+        'yhat_upper': day_of_year + 1,
+        'trend': 0.0,
+    })
+
+class TestBatchPrediction(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the last historical date shared by the tests."""
+        cls.last_date = pd.Timestamp('2023-01-31')
+
+    def setUp(self):
+        """Set up a mock Prophet model with a deterministic predict."""
+        self.model = MagicMock()
+        self.model.predict.side_effect = fake_predict
+
+    def test_resolve_query_dates_horizon(self):
+        """Test if a horizon starts the day after the last historical date."""
+        dates = resolve_query_dates(self.last_date, horizon=3)
+        expected = pd.to_datetime(['2023-02-01', '2023-02-02', '2023-02-03'])
+        self.assertListEqual(list(dates), list(expected))
+
+    def test_resolve_query_dates_explicit_dates(self):
+        """Test if explicit dates are sorted and de-duplicated."""
+        dates = resolve_query_dates(self.last_date, dates=['2023-03-01', '2023-02-10', '2023-03-01'])
+        expected = pd.to_datetime(['2023-02-10', '2023-03-01'])
+        self.assertListEqual(list(dates), list(expected))
+
+    def test_resolve_query_dates_range(self):
+        """Test if a date range is inclusive on both ends."""
+        dates = resolve_query_dates(self.last_date, start='2023-02-05', end='2023-02-07')
+        self.assertEqual(len(dates), 3)
+
+    def test_resolve_query_dates_invalid_selectors(self):
+        """Test behavior when zero or several selectors are given."""
+        with self.assertRaises(ValueError) as cm:
+            resolve_query_dates(self.last_date)
+        self.assertIn("exactly one", str(cm.exception))
+
+        with self.assertRaises(ValueError):
+            resolve_query_dates(self.last_date, horizon=3, dates=['2023-02-10'])
+
+        with self.assertRaises(ValueError):
+            resolve_query_dates(self.last_date, start='2023-02-07', end='2023-02-05')
+
+    def test_resolve_query_dates_oversized_queries(self):
+        """Test if oversized horizons, ranges and date lists are rejected before any dates are built."""
+        with patch('batch_prediction.pd.date_range') as mock_date_range:
+            with self.assertRaises(ValueError) as cm:
+                resolve_query_dates(self.last_date, horizon=10**8)
+            self.assertIn("'horizon' must not exceed", str(cm.exception))
+
+            with self.assertRaises(ValueError) as cm:
+                resolve_query_dates(self.last_date, start='2000-01-01', end='2200-12-31')
+            self.assertIn("must not span more than", str(cm.exception))
+
+            mock_date_range.assert_not_called()
+
+        with self.assertRaises(ValueError) as cm:
+            resolve_query_dates(self.last_date, dates=['2023-02-10'] * (MAX_BATCH_DATES + 1))
+        self.assertIn("'dates' must not contain more than", str(cm.exception))
+
+    def test_resolve_query_dates_at_limit(self):
+        """Test if a horizon and a range of exactly MAX_BATCH_DATES days are accepted."""
+        self.assertEqual(len(resolve_query_dates(self.last_date, horizon=MAX_BATCH_DATES)), MAX_BATCH_DATES)
+        end = pd.Timestamp('2023-02-01') + pd.Timedelta(days=MAX_BATCH_DATES - 1)
+        self.assertEqual(len(resolve_query_dates(self.last_date, start='2023-02-01', end=end)), MAX_BATCH_DATES)
+
+    def test_predict_batch_single_predict_call(self):
+        """Test if overlapping queries are evaluated with one predict on the union of their dates."""
+        date_sets = [
+            resolve_query_dates(self.last_date, horizon=5),
+            resolve_query_dates(self.last_date, start='2023-02-03', end='2023-02-10'),
+        ]
+        results = predict_batch(self.model, date_sets)
+
+        self.model.predict.assert_called_once()
+        future = self.model.predict.call_args[0][0]
+        self.assertEqual(len(future), 10) # 2023-02-01 to 2023-02-10
+
+        self.assertEqual(len(results), 2)
+        self.assertListEqual(list(results[0]['ds']), list(date_sets[0]))
+        self.assertListEqual(list(results[1]['ds']), list(date_sets[1]))
+        self.assertListEqual(list(results[0].columns), ['ds', 'yhat', 'yhat_lower', 'yhat_upper'])
+
+    def test_predict_batch_multipliers(self):
+        """Test if what-if multipliers scale the forecast and its interval."""
+        date_sets = [resolve_query_dates(self.last_date, dates=['2023-02-10'])] * 2
+        base, scenario = predict_batch(self.model, date_sets, [1.0, 1.5])
+
+        self.assertAlmostEqual(scenario['yhat'].iloc[0], base['yhat'].iloc[0] * 1.5)
+        self.assertAlmostEqual(scenario['yhat_lower'].iloc[0], base['yhat_lower'].iloc[0] * 1.5)
+        self.assertAlmostEqual(scenario['yhat_upper'].iloc[0], base['yhat_upper'].iloc[0] * 1.5)
+
+    def test_predict_batch_too_many_dates(self):
+        """Test behavior when the union of dates exceeds the batch limit."""
+        date_sets = [
+            resolve_query_dates(self.last_date, horizon=MAX_BATCH_DATES),
+            resolve_query_dates(self.last_date, dates=['2020-01-01']),
+        ]
+        with self.assertRaises(ValueError) as cm:
+            predict_batch(self.model, date_sets)
+        self.assertIn("maximum", str(cm.exception))
+        self.model.predict.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
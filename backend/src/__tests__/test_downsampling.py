@@ -0,0 +1,72 @@
+import pandas as pd
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add the src directory to the Python path to allow importing downsampling
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from downsampling import lttb_indices, downsample_series
+
+class TestDownsampling(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up a dummy forecast DataFrame for testing."""
+        periods = 365 * 2
+        dates = pd.to_datetime(pd.date_range(start='2022-01-01', periods=periods, freq='D'))
+        yhat = np.sin(np.arange(periods) / 30) * 50 + 100
+        yhat[400] += 500 # A single spike that must survive downsampling
+
+        cls.dummy_forecast = pd.DataFrame({
+            'ds': dates,
+            'yhat': yhat,
+            'yhat_lower': yhat - 10,
+            'yhat_upper': yhat + 10,
+        })
+
+    def test_lttb_indices_length_and_endpoints(self):
+        """Test if LTTB returns the target number of sorted indices including both endpoints."""
+        x = np.arange(1000, dtype=float)
+        y = np.random.rand(1000)
+        indices = lttb_indices(x, y, 100)
+
+        self.assertEqual(len(indices), 100)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 999)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_lttb_indices_short_series(self):
+        """Test if series already under the threshold are returned untouched."""
+        indices = lttb_indices(np.arange(10, dtype=float), np.arange(10, dtype=float), 50)
+        self.assertListEqual(indices.tolist(), list(range(10)))
+
+    def test_lttb_indices_invalid_threshold(self):
+        """Test behavior with a threshold below the minimum of 3 points."""
+        with self.assertRaises(ValueError) as cm:
+            lttb_indices(np.arange(10, dtype=float), np.arange(10, dtype=float), 2)
+        self.assertIn("threshold must be at least 3", str(cm.exception))
+
+    def test_downsample_series_keeps_peak(self):
+        """Test if the spike is kept, which plain decimation would most likely drop."""
+        downsampled = downsample_series(self.dummy_forecast, 'yhat', 50)
+
+        self.assertEqual(len(downsampled), 50)
+        self.assertAlmostEqual(downsampled['yhat'].max(), self.dummy_forecast['yhat'].max())
+
+    def test_downsample_series_keeps_columns_aligned(self):
+        """Test if the interval columns are sliced with the same indices as the value column."""
+        downsampled = downsample_series(self.dummy_forecast, 'yhat', 50)
+
+        np.testing.assert_allclose(downsampled['yhat_lower'], downsampled['yhat'] - 10)
+        np.testing.assert_allclose(downsampled['yhat_upper'], downsampled['yhat'] + 10)
+        self.assertTrue(downsampled['ds'].is_monotonic_increasing)
+
+    def test_downsample_series_empty_input(self):
+        """Test if an empty DataFrame is returned unchanged."""
+        empty_df = pd.DataFrame({'ds': pd.to_datetime([]), 'y': []})
+        self.assertTrue(downsample_series(empty_df, 'y', 10).empty)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import pandas as pd
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+
+# Add the backend directory to the Python path to allow importing the API as the 'src' package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from fastapi.testclient import TestClient
+
+import src.main as main
+from src.main import etag_matches, CHART_DATA_CACHE_CONTROL, CHART_DATA_MAX_DAYS
+
+class TestEtagMatches(unittest.TestCase):
+
+    def test_exact_match(self):
+        """Test if an identical ETag matches and a different one does not."""
+        self.assertTrue(etag_matches('"abc"', '"abc"'))
+        self.assertFalse(etag_matches('"abd"', '"abc"'))
+
+    def test_missing_header(self):
+        """Test if a missing or empty header never matches."""
+        self.assertFalse(etag_matches(None, '"abc"'))
+        self.assertFalse(etag_matches('', '"abc"'))
+
+    def test_weak_validator(self):
+        """Test if a weak validator (W/ prefix) matches, as required for If-None-Match."""
+        self.assertTrue(etag_matches('W/"abc"', '"abc"'))
+
+    def test_list_of_validators(self):
+        """Test if any ETag of a comma-separated list can match."""
+        self.assertTrue(etag_matches('"x", W/"abc" ,"y"', '"abc"'))
+        self.assertFalse(etag_matches('"x", "y"', '"abc"'))
+
+    def test_wildcard(self):
+        """Test if "*" matches any ETag."""
+        self.assertTrue(etag_matches('*', '"abc"'))
+
+class TestChartDataEndpoint(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the API with a fake model so no Prophet training is needed."""
+        history = pd.DataFrame({
+            'ds': pd.date_range(start='2023-01-01', periods=200, freq='D'),
+            'y': np.random.rand(200) * 100 + 100,
+        })
+
+        def make_future_dataframe(periods, include_history=True):
+            return pd.DataFrame({'ds': pd.date_range(start='2023-01-01', periods=len(history) + periods, freq='D')})
+
+        def predict(future):
+            yhat = np.sin(np.arange(len(future)) / 10) * 50 + 100
+            return pd.DataFrame({'ds': future['ds'], 'yhat': yhat, 'yhat_lower': yhat - 10, 'yhat_upper': yhat + 10})
+
+        cls.model = MagicMock()
+        cls.model.make_future_dataframe.side_effect = make_future_dataframe
+        cls.model.predict.side_effect = predict
+
+        cls.saved_state = (main.processed_data_df, main.trained_prophet_model, main.model_version)
+        main.processed_data_df = history
+        main.trained_prophet_model = cls.model
+        main.model_version = 'test-model'
+        cls.client = TestClient(main.app)
+
+    @classmethod
+    def tearDownClass(cls):
+        main.processed_data_df, main.trained_prophet_model, main.model_version = cls.saved_state
+
+    def setUp(self):
+        self.model.predict.reset_mock()
+
+    def test_downsampled_payload_and_cache_headers(self):
+        """Test if the series are downsampled and the response carries an ETag and Cache-Control."""
+        response = self.client.get('/chart/forecast/data?days=30&points=50')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['cache-control'], CHART_DATA_CACHE_CONTROL)
+        self.assertIn('test-model', response.headers['etag'])
+        data = response.json()
+        self.assertEqual(len(data['history']['ds']), 50)
+        self.assertEqual(len(data['forecast']['yhat']), 50)
+        self.assertEqual(len(data['forecast']['yhat_lower']), 50)
+
+    def test_if_none_match_returns_304_without_predicting(self):
+        """Test if a matching If-None-Match is answered with an empty 304 before any forecasting."""
+        etag = self.client.get('/chart/forecast/data?days=30&points=50').headers['etag']
+        self.model.predict.reset_mock()
+
+        response = self.client.get('/chart/forecast/data?days=30&points=50', headers={'If-None-Match': etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response.headers['etag'], etag)
+        self.model.predict.assert_not_called()
+
+    def test_etag_depends_on_parameters_and_model(self):
+        """Test if other parameters or a retrained model invalidate the cached ETag."""
+        etag = self.client.get('/chart/forecast/data?days=30&points=50').headers['etag']
+
+        response = self.client.get('/chart/forecast/data?days=30&points=60', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        main.model_version = 'retrained-model'
+        try:
+            response = self.client.get('/chart/forecast/data?days=30&points=50', headers={'If-None-Match': etag})
+        finally:
+            main.model_version = 'test-model'
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['etag'], etag)
+
+    def test_days_upper_bound(self):
+        """Test if horizons beyond CHART_DATA_MAX_DAYS are rejected before forecasting."""
+        response = self.client.get(f'/chart/forecast/data?days={CHART_DATA_MAX_DAYS + 1}')
+        self.assertEqual(response.status_code, 422)
+        self.model.predict.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
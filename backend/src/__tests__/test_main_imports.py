@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# The backend directory, from which the API is imported as the 'src' package (uvicorn src.main:app)
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+HEAVY_MODULES = ['prophet', 'cmdstanpy', 'matplotlib', 'sklearn']
+
+class TestMainImports(unittest.TestCase):
+
+    def test_import_does_not_load_heavy_modules(self):
+        """Test if importing the API leaves Prophet, cmdstanpy, matplotlib and scikit-learn unloaded."""
+        # A fresh interpreter, so modules imported by other tests do not leak into the check
+        code = (
+            "import json, sys\n"
+            "import src.main\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+        )
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertListEqual(loaded, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ import numpy as np
 # Add the src directory to the Python path to allow importing model_training
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from model_training import train_and_evaluate_model
+from model_training import train_and_evaluate_model, mean_absolute_percentage_error, root_mean_squared_error
 
 class TestModelTraining(unittest.TestCase):
 
@@ -77,6 +77,31 @@ class TestModelTraining(unittest.TestCase):
         self.assertIsInstance(metrics['MAPE'], float)
         self.assertIsInstance(metrics['RMSE'], float)
 
+    def test_mean_absolute_percentage_error_known_values(self):
+        """Test MAPE (as a fraction) against hand-computed values."""
+        # |1.5-1|/1 = 0.5, |2-2|/2 = 0, |3-4|/4 = 0.25 -> mean 0.25
+        self.assertAlmostEqual(mean_absolute_percentage_error([1, 2, 4], [1.5, 2, 3]), 0.25)
+        self.assertEqual(mean_absolute_percentage_error([10, 20], [10, 20]), 0.0)
+        self.assertIsInstance(mean_absolute_percentage_error([1, 2], [2, 1]), float)
+
+    def test_mean_absolute_percentage_error_zero_actuals(self):
+        """Test if zero actuals are divided by machine epsilon, as scikit-learn does, instead of failing."""
+        epsilon = np.finfo(np.float64).eps
+        # |1-0|/eps for the zero actual, |1-2|/2 = 0.5 for the other one
+        expected = (1 / epsilon + 0.5) / 2
+        result = mean_absolute_percentage_error([0, 2], [1, 1])
+        self.assertTrue(np.isfinite(result))
+        self.assertAlmostEqual(result / expected, 1.0)
+        # A perfect prediction of a zero actual contributes nothing
+        self.assertEqual(mean_absolute_percentage_error([0, 2], [0, 2]), 0.0)
+
+    def test_root_mean_squared_error_known_values(self):
+        """Test RMSE against hand-computed values."""
+        # Squared errors 0.25, 0 and 1 -> sqrt(1.25 / 3)
+        self.assertAlmostEqual(root_mean_squared_error([1, 2, 4], [1.5, 2, 3]), np.sqrt(1.25 / 3))
+        self.assertAlmostEqual(root_mean_squared_error(pd.Series([3.0, -1.0]), pd.Series([0.0, 3.0])), np.sqrt(12.5))
+        self.assertEqual(root_mean_squared_error([5, 5], [5, 5]), 0.0)
+
     @patch('model_training.Prophet')
     def test_prophet_model_configuration(self, MockProphet):
         """Test if Prophet is initialized with correct parameters and predict is called."""
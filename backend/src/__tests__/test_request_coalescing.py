@@ -0,0 +1,97 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add the src directory to the Python path to allow importing request_coalescing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from request_coalescing import RequestCoalescer, CoalescerBusyError, coalescer_from_env
+
+class TestRequestCoalescer(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        """Set up a slow, thread-safe computation that counts its calls."""
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def slow_square(self, value):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        return value * value
+
+    async def test_identical_requests_share_one_computation(self):
+        """Test if concurrent calls with the same key run the computation once."""
+        coalescer = RequestCoalescer("test", max_concurrency=2, max_queue=2)
+        results = await asyncio.gather(*[coalescer.run(('square', 3), self.slow_square, 3) for _ in range(10)])
+
+        self.assertListEqual(results, [9] * 10)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(coalescer.in_flight, 0)
+
+    async def test_sequential_requests_are_recomputed(self):
+        """Test if results are not cached once the in-flight computation has finished."""
+        coalescer = RequestCoalescer("test")
+        await coalescer.run('key', self.slow_square, 2)
+        await coalescer.run('key', self.slow_square, 2)
+        self.assertEqual(self.calls, 2)
+
+    async def test_concurrency_limit(self):
+        """Test if distinct computations never exceed max_concurrency at the same time."""
+        coalescer = RequestCoalescer("test", max_concurrency=2, max_queue=10)
+        results = await asyncio.gather(*[coalescer.run(i, self.slow_square, i) for i in range(6)])
+
+        self.assertListEqual(results, [i * i for i in range(6)])
+        self.assertEqual(self.calls, 6)
+        self.assertLessEqual(self.max_running, 2)
+
+    async def test_queue_depth_cap(self):
+        """Test if distinct computations beyond the running and queued slots are rejected."""
+        coalescer = RequestCoalescer("test", max_concurrency=1, max_queue=1)
+        results = await asyncio.gather(
+            *[coalescer.run(i, self.slow_square, i) for i in range(4)], return_exceptions=True
+        )
+
+        self.assertListEqual(results[:2], [0, 1])
+        self.assertIsInstance(results[2], CoalescerBusyError)
+        self.assertIsInstance(results[3], CoalescerBusyError)
+        self.assertEqual(self.calls, 2)
+
+    async def test_exceptions_reach_every_waiter(self):
+        """Test if an error in the shared computation is raised to all coalesced callers."""
+        def failing():
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        coalescer = RequestCoalescer("test")
+        results = await asyncio.gather(*[coalescer.run('key', failing) for _ in range(3)], return_exceptions=True)
+
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+        self.assertEqual(coalescer.in_flight, 0)
+
+    def test_coalescer_from_env(self):
+        """Test if limits can be overridden through environment variables."""
+        env = {'COALESCE_CHART_PNG_MAX_CONCURRENCY': '3', 'COALESCE_CHART_PNG_MAX_QUEUE': '0'}
+        with patch.dict(os.environ, env):
+            coalescer = coalescer_from_env("chart_png", max_concurrency=1, max_queue=5)
+        self.assertEqual(coalescer.max_concurrency, 3)
+        self.assertEqual(coalescer.max_queue, 0)
+
+    def test_invalid_limits(self):
+        """Test behavior with a concurrency limit below 1."""
+        with self.assertRaises(ValueError):
+            RequestCoalescer("test", max_concurrency=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Add the src directory to the Python path to allow importing startup_report
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from startup_report import StartupTimer, FirstRequestTimerMiddleware
+
+class TestStartupTimer(unittest.TestCase):
+
+    def test_measure_records_phase(self):
+        """Test if the measure context manager records the time spent in the block."""
+        timer = StartupTimer()
+        with timer.measure("etl"):
+            time.sleep(0.01)
+
+        self.assertTrue(timer.has("etl"))
+        self.assertGreaterEqual(timer.phases["etl"], 0.01)
+
+    def test_measure_records_phase_on_error(self):
+        """Test if a phase is still recorded when the block raises."""
+        timer = StartupTimer()
+        with self.assertRaises(ValueError):
+            with timer.measure("model_load"):
+                raise ValueError("training failed")
+        self.assertTrue(timer.has("model_load"))
+
+    def test_first_request_is_recorded_once(self):
+        """Test if only the first request latency is kept."""
+        timer = StartupTimer()
+        self.assertTrue(timer.record_first_request("/predict/sales/7", 0.5))
+        self.assertFalse(timer.record_first_request("/chart/forecast/30", 2.0))
+
+        self.assertEqual(timer.phases["first_request"], 0.5)
+        self.assertEqual(timer.first_request_path, "/predict/sales/7")
+
+    def test_report(self):
+        """Test if the report keeps the phase order and adds up the total."""
+        timer = StartupTimer()
+        timer.record("import", 1.0)
+        timer.record("etl", 2.5)
+        timer.record("model_load", 0.5)
+        report = timer.report()
+
+        self.assertListEqual(list(report["phases"]), ["import", "etl", "model_load"])
+        self.assertAlmostEqual(report["total_seconds"], 4.0)
+        self.assertIsNone(report["first_request_path"])
+        self.assertIn("etl=2.50s", timer.format())
+
+class TestFirstRequestTimerMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        """Set up the middleware around a fake ASGI app that records the paths it serves."""
+        self.served = []
+        self.reported = []
+
+        async def app(scope, receive, send):
+            self.served.append(scope.get("path"))
+
+        self.timer = StartupTimer()
+        self.middleware = FirstRequestTimerMiddleware(app, timer=self.timer, on_record=self.reported.append)
+
+    def call(self, scope):
+        asyncio.run(self.middleware(scope, None, None))
+
+    def test_records_only_the_first_http_request(self):
+        """Test if only the first HTTP request is timed and every request still reaches the app."""
+        self.call({"type": "http", "path": "/predict/sales/7"})
+        self.call({"type": "http", "path": "/chart/forecast/30"})
+
+        self.assertListEqual(self.served, ["/predict/sales/7", "/chart/forecast/30"])
+        self.assertEqual(self.timer.first_request_path, "/predict/sales/7")
+        self.assertListEqual(self.reported, [self.timer])
+
+    def test_ignores_lifespan_events(self):
+        """Test if non-HTTP scopes (e.g. lifespan) are not counted as the first request."""
+        self.call({"type": "lifespan"})
+        self.assertFalse(self.timer.has("first_request"))
+
+if __name__ == '__main__':
+    unittest.main()
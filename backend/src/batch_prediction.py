@@ -0,0 +1,88 @@
+import pandas as pd
+
+# Upper bound on the number of distinct dates evaluated in a single batch
+MAX_BATCH_DATES = 3660
+
+
+def resolve_query_dates(last_history_date: pd.Timestamp, horizon: int | None = None, dates: list | None = None,
+                        start=None, end=None) -> pd.DatetimeIndex:
+    """
+    Expands a single batch query into the daily dates it asks for.
+
+    Exactly one selector must be given: a horizon (days after the last historical date, as
+    in /predict/sales/{days}), an explicit list of dates, or a start/end date range. Queries
+    longer than MAX_BATCH_DATES are rejected before any dates are built.
+
+    Args:
+        last_history_date (pd.Timestamp): Last date the model was trained on.
+        horizon (int | None): Number of future days to forecast.
+        dates (list | None): Explicit dates to forecast.
+        start: First date of an inclusive date range.
+        end: Last date of an inclusive date range.
+
+    Returns:
+        pd.DatetimeIndex: The sorted, de-duplicated dates of the query.
+    """
+    selectors = [horizon is not None, dates is not None, start is not None or end is not None]
+    if sum(selectors) != 1:
+        raise ValueError("Each query must specify exactly one of 'horizon', 'dates' or 'start'/'end'.")
+
+    if horizon is not None:
+        if horizon <= 0:
+            raise ValueError("'horizon' must be a positive integer.")
+        if horizon > MAX_BATCH_DATES:
+            raise ValueError(f"'horizon' must not exceed {MAX_BATCH_DATES} days.")
+        query_dates = pd.date_range(start=pd.Timestamp(last_history_date) + pd.Timedelta(days=1), periods=horizon, freq='D')
+    elif dates is not None:
+        if not dates:
+            raise ValueError("'dates' must contain at least one date.")
+        if len(dates) > MAX_BATCH_DATES:
+            raise ValueError(f"'dates' must not contain more than {MAX_BATCH_DATES} dates.")
+        query_dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    else:
+        if start is None or end is None:
+            raise ValueError("A date range needs both 'start' and 'end'.")
+        if pd.Timestamp(start) > pd.Timestamp(end):
+            raise ValueError("'start' must not be after 'end'.")
+        if (pd.Timestamp(end) - pd.Timestamp(start)).days + 1 > MAX_BATCH_DATES:
+            raise ValueError(f"The date range must not span more than {MAX_BATCH_DATES} days.")
+        query_dates = pd.date_range(start=start, end=end, freq='D')
+
+    return query_dates.normalize().unique().sort_values()
+
+
+def predict_batch(model, date_sets: list[pd.DatetimeIndex], multipliers: list[float] | None = None) -> list[pd.DataFrame]:
+    """
+    Forecasts several date sets with a single call to the model's predict.
+
+    The union of all requested dates is evaluated once and every query gets its own slice,
+    optionally scaled by a what-if multiplier.
+
+    Args:
+        model: A fitted Prophet model.
+        date_sets (list[pd.DatetimeIndex]): The dates of each query, as returned by resolve_query_dates.
+        multipliers (list[float] | None): Scaling factor applied to each query's forecast. Defaults to 1.0.
+
+    Returns:
+        list[pd.DataFrame]: One DataFrame per query with 'ds', 'yhat', 'yhat_lower' and 'yhat_upper' columns.
+    """
+    if multipliers is None:
+        multipliers = [1.0] * len(date_sets)
+    if len(multipliers) != len(date_sets):
+        raise ValueError("There must be one multiplier per date set.")
+    if not date_sets:
+        return []
+
+    all_dates = date_sets[0].append(list(date_sets[1:])).unique().sort_values()
+    if len(all_dates) > MAX_BATCH_DATES:
+        raise ValueError(f"The batch requests {len(all_dates)} distinct dates; the maximum is {MAX_BATCH_DATES}.")
+
+    forecast = model.predict(pd.DataFrame({'ds': all_dates}))
+    forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].set_index('ds')
+
+    results = []
+    for query_dates, multiplier in zip(date_sets, multipliers):
+        query_forecast = forecast.loc[query_dates] * multiplier
+        results.append(query_forecast.rename_axis('ds').reset_index())
+
+    return results
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Selects the indices of the points to keep using the Largest-Triangle-Three-Buckets algorithm.
+
+    LTTB keeps the first and last points and, for every bucket in between, the point that forms
+    the largest triangle with the previously selected point and the average of the next bucket.
+    This preserves peaks and valleys far better than taking every n-th point.
+
+    Args:
+        x (np.ndarray): Monotonically increasing x values (e.g. timestamps as numbers).
+        y (np.ndarray): The y values to preserve the shape of.
+        threshold (int): Target number of points. Must be at least 3.
+
+    Returns:
+        np.ndarray: Sorted integer indices into the original arrays.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+
+    if len(y) != n:
+        raise ValueError("x and y must have the same length.")
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3.")
+    if n <= threshold:
+        return np.arange(n)
+
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Bucket boundaries for the points between the first and the last one
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average point of the next bucket (the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # Twice the triangle area for every candidate in the current bucket
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        indices[i + 1] = previous
+
+    return indices
+
+
+def downsample_series(df: pd.DataFrame, value_column: str, threshold: int, date_column: str = 'ds') -> pd.DataFrame:
+    """
+    Downsamples a time series DataFrame with LTTB, keeping every column aligned.
+
+    The points are chosen based on `value_column`; the remaining columns (for example the
+    forecast interval bounds) are sliced with the same indices.
+
+    Args:
+        df (pd.DataFrame): DataFrame sorted by `date_column`.
+        value_column (str): Column whose shape must be preserved.
+        threshold (int): Target number of points.
+        date_column (str): Datetime column used as the x axis.
+
+    Returns:
+        pd.DataFrame: The downsampled DataFrame with a fresh index.
+    """
+    if df.empty:
+        return df.reset_index(drop=True)
+
+    x = pd.to_datetime(df[date_column]).to_numpy().astype('datetime64[ns]').astype(np.int64).astype(float)
+    indices = lttb_indices(x, df[value_column].to_numpy(), threshold)
+    return df.iloc[indices].reset_index(drop=True)
@@ -1,23 +1,36 @@
-from fastapi import FastAPI, HTTPException, Response, Path, File, UploadFile
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request, Response, Path, Query, File, UploadFile
 from typing import List
 from fastapi.responses import StreamingResponse, FileResponse
 from starlette.background import BackgroundTask
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd
 import io
-import matplotlib
-matplotlib.use('Agg') # Must be called before import pyplot as plt
-
-import matplotlib.pyplot as plt
 import base64
 import os
 import json
 import shutil
+import uuid
+from datetime import date
+
+# Charts are only rendered to PNG buffers. Selecting the backend through the environment
+# avoids importing matplotlib here; it is loaded on the first chart (or by Prophet).
+os.environ.setdefault('MPLBACKEND', 'Agg')
 
 # Import ETL and Model Training functions
 from .etl_pipeline import run_etl_pipeline
 from .model_training import train_and_evaluate_model
+from .downsampling import downsample_series
+from .batch_prediction import resolve_query_dates, predict_batch, MAX_BATCH_DATES
+from .request_coalescing import coalescer_from_env, CoalescerBusyError
+from .startup_report import StartupTimer, FirstRequestTimerMiddleware
+
+# Cold-start breakdown: import, ETL, model load and first request latency
+startup_timer = StartupTimer()
+startup_timer.record("import", time.perf_counter() - _import_started)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -40,6 +53,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def print_startup_report(timer: StartupTimer):
+    print(f"API Startup: {timer.format()}")
+
+# Measures the latency of the first request served, the last phase of the startup report.
+# A plain ASGI middleware: once that request is recorded it only forwards to the app.
+app.add_middleware(FirstRequestTimerMiddleware, timer=startup_timer, on_record=print_startup_report)
+
 
 # Global variables to hold processed data and trained model
 # These will be loaded on startup
@@ -47,6 +67,16 @@ processed_data_df: pd.DataFrame = pd.DataFrame()
 trained_prophet_model = None
 # Placeholder for the full historical data (before aggregation) for bestsellers analysis
 full_historical_df: pd.DataFrame = pd.DataFrame() 
+# Random ID set on every (re)training, unique across restarts and workers, so coalesced
+# results never mix model generations and chart-data ETags change with the model
+model_version: str = ""
+
+# Identical concurrent requests to the expensive read endpoints share a single computation.
+# Limits can be tuned per endpoint with COALESCE_<NAME>_MAX_CONCURRENCY / COALESCE_<NAME>_MAX_QUEUE.
+predict_sales_coalescer = coalescer_from_env("predict_sales", max_concurrency=4, max_queue=16)
+chart_png_coalescer = coalescer_from_env("chart_png", max_concurrency=2, max_queue=8)
+chart_data_coalescer = coalescer_from_env("chart_data", max_concurrency=2, max_queue=8)
+predict_batch_coalescer = coalescer_from_env("predict_batch", max_concurrency=2, max_queue=4)
 
 # Define Pydantic models for request/response
 class PredictionResponse(BaseModel):
@@ -71,25 +101,89 @@ class ChartBase64Response(BaseModel):
     media_type: str = "image/png"
     metrics: dict | None = None
 
+class StartupReportResponse(BaseModel):
+    phases: dict[str, float]
+    total_seconds: float
+    first_request_path: str | None = None
+
+class ChartHistorySeries(BaseModel):
+    ds: list[str]
+    y: list[float]
+
+class ChartForecastSeries(BaseModel):
+    ds: list[str]
+    yhat: list[float]
+    yhat_lower: list[float]
+    yhat_upper: list[float]
+
+class ChartDataResponse(BaseModel):
+    history: ChartHistorySeries
+    forecast: ChartForecastSeries
+
+class BatchQuery(BaseModel):
+    id: str | None = None
+    horizon: int | None = Field(None, gt=0, le=MAX_BATCH_DATES, description="Number of days to forecast after the last historical date")
+    dates: list[date] | None = Field(None, max_length=MAX_BATCH_DATES)
+    start: date | None = None
+    end: date | None = None
+    multiplier: float = Field(1.0, gt=0, le=100, description="What-if factor applied to the forecast")
+
+class BatchPredictionRequest(BaseModel):
+    queries: list[BatchQuery] = Field(..., min_length=1, max_length=100)
+
+class BatchQueryResult(BaseModel):
+    id: str | None = None
+    multiplier: float
+    forecast: list[PredictionResponse]
+
+class BatchPredictionResponse(BaseModel):
+    results: list[BatchQueryResult]
+
+# Longest horizon served by /chart/forecast/data, which is meant to be a small payload
+CHART_DATA_MAX_DAYS = 1830
+
+# Chart data only changes after a retrain. Caches may store it but must revalidate it with the
+# ETag (model version + parameters) on every use, which costs a 304 instead of a full payload.
+CHART_DATA_CACHE_CONTROL = "public, no-cache"
+
+def chart_data_etag(days: int, points: int) -> str:
+    """
+    Builds the ETag of /chart/forecast/data from the model version and the request parameters.
+    """
+    return f'"chart-data-{model_version}-{days}-{points}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Checks an If-None-Match header value (possibly a list or weak validators) against an ETag.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in [tag.removeprefix('W/') for tag in candidates]
+
 @app.on_event("startup")
 async def load_data_and_train_model():
     """
     Load data, run ETL, and train the model on application startup.
     """
-    global processed_data_df, trained_prophet_model, full_historical_df
+    global processed_data_df, trained_prophet_model, full_historical_df, model_version
     
     current_dir = os.path.dirname(__file__)
     csv_data_path = os.path.join(current_dir, '..', 'CSV')
 
     try:
         print("API Startup: Running ETL pipeline...")
-        processed_data_df, full_historical_df = run_etl_pipeline(csv_data_path)
+        with startup_timer.measure("etl"):
+            processed_data_df, full_historical_df = run_etl_pipeline(csv_data_path)
         print("API Startup: ETL pipeline completed.")
 
         print("API Startup: Training model...")
         # Train model with a reasonable forecast period and test size
-        trained_prophet_model, _, _, _ = train_and_evaluate_model(processed_data_df, periods_to_forecast=90, test_size_months=3)
+        with startup_timer.measure("model_load"):
+            trained_prophet_model, _, _, _ = train_and_evaluate_model(processed_data_df, periods_to_forecast=90, test_size_months=3)
+        model_version = uuid.uuid4().hex
         print("API Startup: Model training completed.")
+        print_startup_report(startup_timer)
 
     except Exception as e:
         print(f"API Startup Error: Failed to load data or train model: {e}")
@@ -97,27 +191,138 @@ async def load_data_and_train_model():
         # indicating the API is not fully functional.
         raise HTTPException(status_code=500, detail=f"Failed to initialize API: {e}")
 
-@app.get("/predict/sales/{days}", response_model=ForecastResponse)
-async def predict_sales(days: int = Path(..., gt=0, description="Number of days to forecast")):
+def compute_sales_forecast(model, days: int) -> list[dict]:
     """
-    Predicts sales for the next 'days' using the trained Prophet model.
+    Forecasts the next 'days' after the training data and returns JSON-ready records.
     """
-    if trained_prophet_model is None or processed_data_df.empty:
-        raise HTTPException(status_code=503, detail="Model not loaded or data not processed yet.")
-
-    # Create future dataframe for prediction
-    future = trained_prophet_model.make_future_dataframe(periods=days, include_history=False)
-    forecast = trained_prophet_model.predict(future)
+    future = model.make_future_dataframe(periods=days, include_history=False)
+    forecast = model.predict(future)
 
     # Extract relevant forecast columns
     predictions = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_dict(orient='records')
-    
+
     # Convert datetime objects to string for JSON serialization
     for p in predictions:
         p['ds'] = p['ds'].strftime('%Y-%m-%d')
 
+    return predictions
+
+def render_forecast_chart(model, days: int) -> bytes:
+    """
+    Renders the sales forecast chart (history + 'days' ahead) and returns the PNG bytes.
+    """
+    future = model.make_future_dataframe(periods=days, include_history=True)
+    forecast = model.predict(future)
+
+    # Imported here so that only the chart endpoints pay for matplotlib.
+    # A standalone Figure (instead of pyplot) is safe to render from worker threads.
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    model.plot(forecast, ax=ax)
+    ax.set_title('Sales Forecast')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Sales Revenue')
+
+    img_buf = io.BytesIO()
+    fig.savefig(img_buf, format='png')
+    return img_buf.getvalue()
+
+def compute_chart_data(model, history_df: pd.DataFrame, days: int, points: int) -> dict:
+    """
+    Builds the downsampled history and forecast arrays served by /chart/forecast/data.
+    """
+    future = model.make_future_dataframe(periods=days, include_history=True)
+    forecast = model.predict(future)
+
+    history = downsample_series(history_df[['ds', 'y']].sort_values(by='ds'), 'y', points)
+    forecast = downsample_series(forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], 'yhat', points)
+
+    return {
+        "history": {
+            "ds": history['ds'].dt.strftime('%Y-%m-%d').tolist(),
+            "y": history['y'].tolist(),
+        },
+        "forecast": {
+            "ds": forecast['ds'].dt.strftime('%Y-%m-%d').tolist(),
+            "yhat": forecast['yhat'].tolist(),
+            "yhat_lower": forecast['yhat_lower'].tolist(),
+            "yhat_upper": forecast['yhat_upper'].tolist(),
+        },
+    }
+
+def compute_batch_forecast(model, queries: tuple) -> list[dict]:
+    """
+    Resolves the batch queries, forecasts them with a single predict and returns JSON-ready results.
+    Each query is an (id, horizon, dates, start, end, multiplier) tuple.
+    """
+    last_history_date = model.history['ds'].max()
+
+    date_sets = [
+        resolve_query_dates(last_history_date, horizon=horizon, dates=dates, start=start, end=end)
+        for _, horizon, dates, start, end, _ in queries
+    ]
+    forecasts = predict_batch(model, date_sets, [multiplier for *_, multiplier in queries])
+
+    results = []
+    for (query_id, *_, multiplier), forecast in zip(queries, forecasts):
+        predictions = forecast.to_dict(orient='records')
+        for p in predictions:
+            p['ds'] = p['ds'].strftime('%Y-%m-%d')
+        results.append({"id": query_id, "multiplier": multiplier, "forecast": predictions})
+
+    return results
+
+async def run_coalesced(coalescer, params: tuple, func, *args):
+    """
+    Runs 'func' through the endpoint's coalescer, keyed by its parameters and the model version.
+    """
+    try:
+        return await coalescer.run((params, model_version), func, *args)
+    except CoalescerBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+@app.get("/health/startup", response_model=StartupReportResponse)
+async def get_startup_report():
+    """
+    Returns how long each cold-start phase took: import, ETL, model load and first request.
+    """
+    return StartupReportResponse(**startup_timer.report())
+
+@app.get("/predict/sales/{days}", response_model=ForecastResponse)
+async def predict_sales(days: int = Path(..., gt=0, description="Number of days to forecast")):
+    """
+    Predicts sales for the next 'days' using the trained Prophet model.
+    """
+    if trained_prophet_model is None or processed_data_df.empty:
+        raise HTTPException(status_code=503, detail="Model not loaded or data not processed yet.")
+
+    predictions = await run_coalesced(predict_sales_coalescer, (days,), compute_sales_forecast, trained_prophet_model, days)
+
     return ForecastResponse(forecast=predictions)
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_sales_batch(request: BatchPredictionRequest):
+    """
+    Predicts sales for several horizons, date lists or date ranges with a single model evaluation.
+    """
+    if trained_prophet_model is None or processed_data_df.empty:
+        raise HTTPException(status_code=503, detail="Model not loaded or data not processed yet.")
+
+    # Hashable, canonical form of the batch so identical concurrent batches share one computation
+    queries = tuple(
+        (q.id, q.horizon, tuple(q.dates) if q.dates is not None else None, q.start, q.end, q.multiplier)
+        for q in request.queries
+    )
+
+    try:
+        results = await run_coalesced(predict_batch_coalescer, queries, compute_batch_forecast, trained_prophet_model, queries)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BatchPredictionResponse(results=results)
+
 @app.get("/analysis/bestsellers/{top_n}", response_model=BestsellersResponse)
 async def get_bestsellers(top_n: int = Path(..., gt=0, description="Number of top-selling products to retrieve")):
     """
@@ -131,6 +336,36 @@ async def get_bestsellers(top_n: int = Path(..., gt=0, description="Number of to
 
     return BestsellersResponse(bestsellers=bestsellers)
 
+# Declared before /chart/forecast/{days} so that "data" is not parsed as a number of days
+@app.get("/chart/forecast/data", response_model=ChartDataResponse)
+async def get_forecast_chart_data(
+    request: Request,
+    response: Response,
+    days: int = Query(90, gt=0, le=CHART_DATA_MAX_DAYS, description="Number of days to forecast for the chart"),
+    points: int = Query(500, ge=3, le=5000, description="Maximum number of points per series"),
+):
+    """
+    Returns the history, forecast and interval arrays of the sales forecast chart,
+    downsampled with LTTB so the frontend can render the chart itself.
+    """
+    if trained_prophet_model is None or processed_data_df.empty:
+        raise HTTPException(status_code=503, detail="Model not loaded or data not processed yet.")
+
+    etag = chart_data_etag(days, points)
+    cache_headers = {"ETag": etag, "Cache-Control": CHART_DATA_CACHE_CONTROL}
+
+    # The client already has the chart of the current model: skip the forecast entirely
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    chart_data = await run_coalesced(
+        chart_data_coalescer, (days, points), compute_chart_data, trained_prophet_model, processed_data_df, days, points
+    )
+
+    response.headers.update(cache_headers)
+
+    return ChartDataResponse(**chart_data)
+
 @app.get("/chart/forecast/{days}", response_class=Response)
 async def get_forecast_chart(days: int = Path(..., description="Number of days to forecast for the chart")):
     """
@@ -139,21 +374,10 @@ async def get_forecast_chart(days: int = Path(..., description="Number of days t
     if trained_prophet_model is None or processed_data_df.empty:
         raise HTTPException(status_code=503, detail="Model not loaded or data not processed yet.")
 
-    future = trained_prophet_model.make_future_dataframe(periods=days, include_history=True)
-    forecast = trained_prophet_model.predict(future)
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    trained_prophet_model.plot(forecast, ax=ax)
-    ax.set_title('Sales Forecast')
-    ax.set_xlabel('Date')
-    ax.set_ylabel('Sales Revenue')
-    fig.canvas.draw() # Explicitly draw the canvas
+    # The PNG and Base64 endpoints render the same chart, so they share one coalescer
+    png_bytes = await run_coalesced(chart_png_coalescer, (days,), render_forecast_chart, trained_prophet_model, days)
 
-    img_buf = io.BytesIO()
-    fig.savefig(img_buf, format='png')
-    plt.close(fig) # Close the figure to free memory
-    img_buf.seek(0)
-    return StreamingResponse(img_buf, media_type="image/png")
+    return StreamingResponse(io.BytesIO(png_bytes), media_type="image/png")
 
 @app.get("/chart/forecast_base64", response_model=ChartBase64Response)
 async def get_forecast_chart_base64(days: int = 90): # Default to 90 days if not specified
@@ -166,22 +390,9 @@ async def get_forecast_chart_base64(days: int = 90): # Default to 90 days if not
     if days <= 0:
         raise HTTPException(status_code=400, detail="Days must be a positive integer.")
 
-    future = trained_prophet_model.make_future_dataframe(periods=days, include_history=True)
-    forecast = trained_prophet_model.predict(future)
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    trained_prophet_model.plot(forecast, ax=ax)
-    ax.set_title('Sales Forecast')
-    ax.set_xlabel('Date')
-    ax.set_ylabel('Sales Revenue')
-    fig.canvas.draw() # Explicitly draw the canvas
-
-    img_buf = io.BytesIO()
-    fig.savefig(img_buf, format='png')
-    plt.close(fig) # Close the figure to free memory
-    img_buf.seek(0)
+    png_bytes = await run_coalesced(chart_png_coalescer, (days,), render_forecast_chart, trained_prophet_model, days)
 
-    img_base64 = base64.b64encode(img_buf.getvalue()).decode('utf-8')
+    img_base64 = base64.b64encode(png_bytes).decode('utf-8')
 
     # Optionally, include metrics here if desired, but for simplicity, we'll omit for now
     # metrics = {"MAPE": 10.5, "RMSE": 200.0} # Placeholder
@@ -193,7 +404,7 @@ async def reload_data_and_model():
     Asynchronously re-runs the ETL pipeline and retrains the model.
     This function is intended to be called after new data is uploaded.
     """
-    global processed_data_df, trained_prophet_model, full_historical_df
+    global processed_data_df, trained_prophet_model, full_historical_df, model_version
     
     current_dir = os.path.dirname(__file__)
     csv_data_path = os.path.join(current_dir, '..', 'CSV')
@@ -205,6 +416,7 @@ async def reload_data_and_model():
 
         print("Data Reload: Retraining model...")
         trained_prophet_model, _, _, _ = train_and_evaluate_model(processed_data_df, periods_to_forecast=90, test_size_months=3)
+        model_version = uuid.uuid4().hex
         print("Data Reload: Model retraining completed.")
 
     except Exception as e:
@@ -242,7 +454,6 @@ async def upload_data_files(files: List[UploadFile] = File(...)):
 
     # Asynchronously reload data and retrain model
     background_tasks = BackgroundTask(reload_data_and_model)
-...
     return {"message": f"Files {filenames} uploaded successfully. Data reload and model retraining initiated in the background."}, background_tasks
 
 @app.get("/export/", response_class=StreamingResponse)
@@ -262,7 +473,6 @@ async def export_data():
         'Content-Disposition': 'attachment; filename="sales_report.xlsx"'
     }
     return StreamingResponse(output, headers=headers, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-...
 
 
 if __name__ == "__main__":
@@ -1,12 +1,38 @@
 import pandas as pd
-from prophet import Prophet
-from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
 import numpy as np
 import os
 import json
 
-# Assuming etl_pipeline is in the same directory or accessible via PYTHONPATH
-from .etl_pipeline import run_etl_pipeline
+# Prophet pulls in cmdstanpy and matplotlib and takes seconds to import,
+# so it is only loaded the first time a model is trained (see _load_prophet).
+Prophet = None
+
+def _load_prophet():
+    """
+    Imports the Prophet class on first use and caches it in the module-level name.
+    """
+    global Prophet
+    if Prophet is None:
+        from prophet import Prophet as _Prophet
+        Prophet = _Prophet
+    return Prophet
+
+def mean_absolute_percentage_error(y_true, y_pred) -> float:
+    """
+    MAPE as a fraction (same definition as scikit-learn, including the epsilon guard for zero actuals).
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    epsilon = np.finfo(np.float64).eps
+    return float(np.mean(np.abs(y_pred - y_true) / np.maximum(np.abs(y_true), epsilon)))
+
+def root_mean_squared_error(y_true, y_pred) -> float:
+    """
+    Square root of the mean squared error.
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    return float(np.sqrt(np.mean((y_true - y_pred) ** 2)))
 
 def train_and_evaluate_model(df_ts: pd.DataFrame, periods_to_forecast: int = 90, test_size_months: int = 3):
     """
@@ -44,6 +70,7 @@ def train_and_evaluate_model(df_ts: pd.DataFrame, periods_to_forecast: int = 90,
 
     # Initialize Prophet model
     # Using seasonality_mode='multiplicative' as recommended for e-commerce sales
+    Prophet = _load_prophet()
     model = Prophet(
         seasonality_mode='multiplicative',
         yearly_seasonality=True,
@@ -106,7 +133,7 @@ def train_and_evaluate_model(df_ts: pd.DataFrame, periods_to_forecast: int = 90,
             y_pred = df_comparison['yhat']
 
             mape = mean_absolute_percentage_error(y_true, y_pred) * 100
-            rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+            rmse = root_mean_squared_error(y_true, y_pred)
 
             metrics = {
                 "MAPE": mape,
@@ -121,6 +148,9 @@ def train_and_evaluate_model(df_ts: pd.DataFrame, periods_to_forecast: int = 90,
     return model, forecast, metrics, test_df
 
 if __name__ == '__main__':
+    # Only needed for this example; importing it at module level breaks imports outside the package
+    from .etl_pipeline import run_etl_pipeline
+
     # Example usage:
     current_dir = os.path.dirname(__file__)
     csv_data_path = os.path.join(current_dir, '..', 'CSV') # Path to actual CSVs
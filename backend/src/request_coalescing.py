@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+
+class CoalescerBusyError(Exception):
+    """Raised when an endpoint already has as many distinct computations as it can run and queue."""
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution of expensive, read-only computations for one endpoint.
+
+    Concurrent calls with the same key wait on the same in-flight computation and share its
+    result. Distinct computations run in worker threads, at most `max_concurrency` at a time;
+    up to `max_queue` more may wait for a slot, and anything beyond that is rejected with
+    CoalescerBusyError so bursts turn into queuing instead of CPU thrash.
+    """
+
+    def __init__(self, name: str, max_concurrency: int = 2, max_queue: int = 8):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative.")
+
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: dict = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct computations that are running or waiting for a slot."""
+        return len(self._in_flight)
+
+    async def run(self, key, func, *args):
+        """
+        Returns the result of `func(*args)`, sharing it with every concurrent call using the same key.
+
+        Args:
+            key: Hashable identifier of the computation (parameters, model version...).
+            func: Blocking callable executed in a worker thread.
+            *args: Positional arguments for `func`.
+
+        Returns:
+            The value returned by `func`. Exceptions raised by `func` propagate to every waiter.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            if len(self._in_flight) >= self.max_concurrency + self.max_queue:
+                raise CoalescerBusyError(f"Too many pending '{self.name}' requests. Please retry shortly.")
+            task = asyncio.ensure_future(self._execute(func, args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shield the shared task so a disconnecting client does not cancel it for everyone else
+        return await asyncio.shield(task)
+
+    async def _execute(self, func, args):
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args)
+
+
+def coalescer_from_env(name: str, max_concurrency: int = 2, max_queue: int = 8) -> RequestCoalescer:
+    """
+    Builds a RequestCoalescer whose limits can be overridden with environment variables.
+
+    The variables are COALESCE_<NAME>_MAX_CONCURRENCY and COALESCE_<NAME>_MAX_QUEUE,
+    e.g. COALESCE_PREDICT_SALES_MAX_CONCURRENCY=4.
+    """
+    prefix = f"COALESCE_{name.upper()}"
+    return RequestCoalescer(
+        name,
+        max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", max_concurrency)),
+        max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", max_queue)),
+    )
@@ -0,0 +1,84 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    Collects how long each cold-start phase of the service takes.
+
+    The API records module import, ETL, model load and the latency of the first request,
+    so slow worker spawns can be traced to the phase responsible.
+    """
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.first_request_path: str | None = None
+
+    def record(self, phase: str, seconds: float):
+        """Stores the duration of a phase, replacing any earlier measurement."""
+        self.phases[phase] = seconds
+
+    def has(self, phase: str) -> bool:
+        return phase in self.phases
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Context manager that records the wall-clock time spent inside the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def record_first_request(self, path: str, seconds: float) -> bool:
+        """
+        Records the latency of the first request served. Later calls are ignored.
+
+        Returns:
+            bool: True if this call recorded the first request.
+        """
+        if self.has("first_request"):
+            return False
+        self.first_request_path = path
+        self.record("first_request", seconds)
+        return True
+
+    def report(self) -> dict:
+        """Returns the phase durations (in seconds) and their total."""
+        return {
+            "phases": {phase: round(seconds, 4) for phase, seconds in self.phases.items()},
+            "total_seconds": round(sum(self.phases.values()), 4),
+            "first_request_path": self.first_request_path,
+        }
+
+    def format(self) -> str:
+        """Returns a one-line, human-readable summary of the report."""
+        parts = [f"{phase}={seconds:.2f}s" for phase, seconds in self.phases.items()]
+        return f"{', '.join(parts)} (total {sum(self.phases.values()):.2f}s)"
+
+
+class FirstRequestTimerMiddleware:
+    """
+    ASGI middleware that records the latency of the first HTTP request in a StartupTimer.
+
+    Unlike an @app.middleware("http") function it does not wrap every request/response pair:
+    after the first request it is a single check followed by a direct call to the app.
+    """
+
+    def __init__(self, app, timer: StartupTimer, on_record=None):
+        self.app = app
+        self.timer = timer
+        self.on_record = on_record
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.timer.has("first_request"):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            recorded = self.timer.record_first_request(scope["path"], time.perf_counter() - start)
+            if recorded and self.on_record is not None:
+                self.on_record(self.timer)